@@ -0,0 +1,54 @@
+#!/bin/bash
+# PreToolUse hook - Forward hook input to a long-running security reminder daemon
+#
+# Sends the hook input to `security_reminder_hook.py --daemon` over a Unix
+# socket so each call skips Python startup. Starts the daemon when it isn't
+# running, and falls back to running security_reminder_hook.py directly
+# whenever the daemon or `nc` with Unix socket support is unavailable.
+#
+# Exit codes:
+#   0 = Allow operation to proceed (no security issues detected or hook error)
+#   2 = Block operation (security issue detected, warning sent to Claude)
+
+HOOK_SCRIPT="$(dirname "$0")/security_reminder_hook.py"
+SOCKET_FILE="$HOME/.claude/security_reminder.sock"
+PID_FILE="$HOME/.claude/security_reminder.pid"
+
+start_daemon() {
+  # Replaces a stale socket, and exits straight away if a daemon is already serving
+  python3 "$HOOK_SCRIPT" --daemon < /dev/null > /dev/null 2>&1
+}
+
+# Only run if security reminders are enabled
+if [ "${ENABLE_SECURITY_REMINDER:-1}" = "0" ]; then
+  exit 0
+fi
+
+INPUT=$(cat)
+
+if command -v nc &> /dev/null; then
+  if [ -S "$SOCKET_FILE" ]; then
+    # Reply is the exit code on the first line, then the reminder text
+    RESPONSE=$(printf '%s' "$INPUT" | nc -U "$SOCKET_FILE" 2>/dev/null)
+    EXIT_CODE="${RESPONSE%%$'\n'*}"
+
+    if [ "$EXIT_CODE" = "0" ]; then
+      exit 0
+    elif [ "$EXIT_CODE" = "2" ]; then
+      printf '%s\n' "${RESPONSE#*$'\n'}" >&2
+      exit 2
+    fi
+
+    # Only restart a daemon that is gone; if it is still running, this call
+    # just failed, so handle it directly below
+    if ! kill -0 "$(cat "$PID_FILE" 2>/dev/null)" 2> /dev/null; then
+      start_daemon
+    fi
+  elif [ ${#SOCKET_FILE} -lt 104 ] && nc -h 2>&1 | grep -q -- '-U'; then
+    # First call: start the daemon only if this nc can reach Unix sockets and
+    # the socket path fits the platform's limit
+    start_daemon
+  fi
+fi
+
+printf '%s' "$INPUT" | python3 "$HOOK_SCRIPT"
@@ -13,426 +13,166 @@ are detected. Exit code 0 is used both for safe operations and hook errors
 (fail-safe behavior to avoid blocking Claude Code on hook failures).
 """
 
+import atexit
 import json
 import os
-import random
+import re
 import sys
-from datetime import datetime
+import time
 
 # Debug log file
 DEBUG_LOG_FILE = "/tmp/security-warnings-log.txt"
 
+# Buffered handle to DEBUG_LOG_FILE, opened on first use and closed at exit
+_DEBUG_LOG_HANDLE = None
+
+
+def close_debug_log():
+    """Flush and close the debug log handle if it was opened."""
+    try:
+        if _DEBUG_LOG_HANDLE is not None:
+            _DEBUG_LOG_HANDLE.close()
+    except Exception:
+        pass  # Silently ignore logging errors at exit
+
+
+def flush_debug_log():
+    """Write any buffered debug log lines to disk."""
+    try:
+        if _DEBUG_LOG_HANDLE is not None:
+            _DEBUG_LOG_HANDLE.flush()
+    except Exception:
+        pass  # Silently ignore logging errors
+
 
 def debug_log(message):
     """Append debug message to log file with timestamp."""
+    global _DEBUG_LOG_HANDLE
     try:
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        with open(DEBUG_LOG_FILE, "a") as f:
-            f.write(f"[{timestamp}] {message}\n")
+        if _DEBUG_LOG_HANDLE is None:
+            _DEBUG_LOG_HANDLE = open(DEBUG_LOG_FILE, "a", buffering=65536)
+            atexit.register(close_debug_log)
+        now = time.time()
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+        timestamp += f".{int(now % 1 * 1000):03d}"
+        _DEBUG_LOG_HANDLE.write(f"[{timestamp}] {message}\n")
     except Exception as e:
         # Silently ignore logging errors to avoid disrupting the hook
         pass
 
 
+# Importing orjson costs several milliseconds more than json, so it is only
+# worth it for multi-megabyte hook input
+ORJSON_MIN_INPUT_BYTES = 4 * 1024 * 1024
+
 # State file to track warnings shown (session-scoped using session ID)
 
+# Reminder text for each rule lives in reminders/<ruleName>.md and is only read
+# once a rule matches
+REMINDERS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reminders")
+
 # Security patterns configuration
 SECURITY_PATTERNS = [
     {
         "ruleName": "github_actions_workflow",
-        "path_check": lambda path: ".github/workflows/" in path
-        and (path.endswith(".yml") or path.endswith(".yaml")),
-        "reminder": """You are editing a GitHub Actions workflow file. Be aware of these security risks:
-
-1. **Command Injection**: Never use untrusted input (like issue titles, PR descriptions, commit messages) directly in run: commands without proper escaping
-2. **Use environment variables**: Instead of ${{ github.event.issue.title }}, use env: with proper quoting
-3. **Review the guide**: https://github.blog/security/vulnerability-research/how-to-catch-github-actions-workflow-injections-before-attackers-do/
-
-Example of UNSAFE pattern to avoid:
-run: echo "${{ github.event.issue.title }}"
-
-Example of SAFE pattern:
-env:
-  TITLE: ${{ github.event.issue.title }}
-run: echo "$TITLE"
-
-Other risky inputs to be careful with:
-- github.event.issue.body
-- github.event.pull_request.title
-- github.event.pull_request.body
-- github.event.comment.body
-- github.event.review.body
-- github.event.review_comment.body
-- github.event.pages.*.page_name
-- github.event.commits.*.message
-- github.event.head_commit.message
-- github.event.head_commit.author.email
-- github.event.head_commit.author.name
-- github.event.commits.*.author.email
-- github.event.commits.*.author.name
-- github.event.pull_request.head.ref
-- github.event.pull_request.head.label
-- github.event.pull_request.head.repo.default_branch
-- github.head_ref""",
+        "path_pattern": re.compile(r"\.github/workflows/.*\.ya?ml\Z", re.DOTALL),
     },
     {
         "ruleName": "child_process_exec",
         "substrings": ["child_process.exec", "exec(", "execSync("],
-        "reminder": """⚠️ Security Warning: Using child_process.exec() can lead to command injection vulnerabilities.
-
-This codebase provides a safer alternative: src/utils/execFileNoThrow.ts
-
-Instead of:
-  exec(`command ${userInput}`)
-
-Use:
-  import { execFileNoThrow } from '../utils/execFileNoThrow.js'
-  await execFileNoThrow('command', [userInput])
-
-The execFileNoThrow utility:
-- Uses execFile instead of exec (prevents shell injection)
-- Handles Windows compatibility automatically
-- Provides proper error handling
-- Returns structured output with stdout, stderr, and status
-
-Only use exec() if you absolutely need shell features and the input is guaranteed to be safe.""",
     },
     {
         "ruleName": "new_function_injection",
         "substrings": ["new Function"],
-        "reminder": "⚠️ Security Warning: Using new Function() with dynamic strings can lead to code injection vulnerabilities. Consider alternative approaches that don't evaluate arbitrary code. Only use new Function() if you truly need to evaluate arbitrary dynamic code.",
     },
     {
         "ruleName": "eval_injection",
         "substrings": ["eval("],
-        "reminder": "⚠️ Security Warning: eval() executes arbitrary code and is a major security risk. Consider using JSON.parse() for data parsing or alternative design patterns that don't require code evaluation. Only use eval() if you truly need to evaluate arbitrary code.",
     },
     {
         "ruleName": "react_dangerously_set_html",
         "substrings": ["dangerouslySetInnerHTML"],
-        "reminder": "⚠️ Security Warning: dangerouslySetInnerHTML can lead to XSS vulnerabilities if used with untrusted content. Ensure all content is properly sanitized using an HTML sanitizer library like DOMPurify, or use safe alternatives.",
     },
     {
         "ruleName": "document_write_xss",
         "substrings": ["document.write"],
-        "reminder": "⚠️ Security Warning: document.write() can be exploited for XSS attacks and has performance issues. Use DOM manipulation methods like createElement() and appendChild() instead.",
     },
     {
         "ruleName": "innerHTML_xss",
         "substrings": [".innerHTML =", ".innerHTML="],
-        "reminder": "⚠️ Security Warning: Setting innerHTML with untrusted content can lead to XSS vulnerabilities. Use textContent for plain text or safe DOM methods for HTML content. If you need HTML support, consider using an HTML sanitizer library such as DOMPurify.",
     },
     {
         "ruleName": "pickle_deserialization",
         "substrings": ["pickle"],
-        "reminder": "⚠️ Security Warning: Using pickle with untrusted content can lead to arbitrary code execution. Consider using JSON or other safe serialization formats instead. Only use pickle if it is explicitly needed or requested by the user.",
     },
     {
         "ruleName": "os_system_injection",
         "substrings": ["os.system", "from os import system"],
-        "reminder": "⚠️ Security Warning: This code appears to use os.system. This should only be used with static arguments and never with arguments that could be user-controlled.",
     },
     # Frontend-specific security patterns
     {
         "ruleName": "unsafe_href",
         "substrings": ["href={", 'href="{'],
-        "reminder": """⚠️ Security Warning: Dynamic href values can create XSS vulnerabilities.
-
-Dangerous patterns:
-- href={userInput}
-- href={`javascript:${code}`}
-- href={'javascript:' + userCode}
-
-Safe patterns:
-1. Validate URLs against whitelist:
-   ```typescript
-   const isValidUrl = (url: string) => {
-     try {
-       const parsed = new URL(url);
-       return ['http:', 'https:', 'mailto:', 'tel:'].includes(parsed.protocol);
-     } catch {
-       return false;
-     }
-   };
-
-   if (!isValidUrl(userUrl)) {
-     throw new Error('Invalid URL');
-   }
-   ```
-
-2. Use rel="noopener noreferrer" for external links:
-   ```typescript
-   <a href={externalUrl} target="_blank" rel="noopener noreferrer">
-   ```
-
-3. Sanitize user input before using in href attributes.""",
     },
     {
         "ruleName": "unsafe_target_blank",
         "substrings": ['target="_blank"', "target='_blank'"],
-        "reminder": """⚠️ Security Best Practice: Always use rel="noopener noreferrer" with target="_blank".
-
-Why this matters:
-1. **Tabnapping Prevention**: Without rel="noopener", the new page can access window.opener
-2. **Performance**: The new page runs in the same process, impacting performance
-3. **Privacy**: Prevents referer leakage in some cases
-
-Safe pattern:
-```typescript
-<a href={url} target="_blank" rel="noopener noreferrer">
-  Link text
-</a>
-```
-
-Additional considerations:
-- For same-origin links, rel="opener" is safe
-- For external links, ALWAYS use rel="noopener noreferrer"
-- Consider using noreferrer for additional privacy""",
     },
     {
         "ruleName": "localstorage_sensitive_data",
         "substrings": ["localStorage.setItem", "sessionStorage.setItem"],
-        "reminder": """⚠️ Security Warning: Don't store sensitive data in localStorage/sessionStorage.
-
-Why it's dangerous:
-1. Accessible to all JavaScript (including third-party scripts)
-2. Vulnerable to XSS attacks
-3. Persists across sessions (localStorage)
-4. No built-in encryption
-5. Can be accessed by browser extensions
-
-Never store:
-- ❌ Authentication tokens (use httpOnly cookies instead)
-- ❌ API keys or secrets
-- ❌ Passwords or password hashes
-- ❌ Personal identifiable information (PII)
-- ❌ Credit card information
-- ❌ Social security numbers
-
-Safe to store:
-- ✅ User preferences (theme, language)
-- ✅ UI state (sidebar collapsed, tab selection)
-- ✅ Non-sensitive cache data
-- ✅ Analytics IDs (public data)
-
-For authentication tokens:
-```typescript
-// ❌ Bad: Store in localStorage
-localStorage.setItem('authToken', token);
-
-// ✅ Good: Use httpOnly cookies set by backend
-// Server sets: Set-Cookie: authToken=xxx; HttpOnly; Secure; SameSite=Strict
-```""",
     },
     {
         "ruleName": "react_refs_dom_manipulation",
         "substrings": [".innerHTML =", ".outerHTML =", "ref.current"],
-        "reminder": """⚠️ Security Warning: Direct DOM manipulation via refs can introduce XSS vulnerabilities.
-
-Dangerous pattern:
-```typescript
-const ref = useRef<HTMLDivElement>(null);
-ref.current.innerHTML = userContent; // XSS risk!
-```
-
-Safe alternatives:
-1. Use textContent for plain text:
-   ```typescript
-   ref.current.textContent = userContent; // Safe
-   ```
-
-2. Use React's rendering (preferred):
-   ```typescript
-   function Component({ content }: { content: string }) {
-     return <div>{content}</div>; // React auto-escapes
-   }
-   ```
-
-3. If you need HTML, sanitize first:
-   ```typescript
-   import DOMPurify from 'dompurify';
-
-   const sanitized = DOMPurify.sanitize(userHTML);
-   ref.current.innerHTML = sanitized;
-   ```
-
-Best practice: Avoid direct DOM manipulation in React. Let React manage the DOM.""",
     },
     {
         "ruleName": "postmessage_origin",
         "substrings": ["postMessage(", "addEventListener('message'", 'addEventListener("message"'],
-        "reminder": """⚠️ Security Warning: Always validate origin when using postMessage API.
-
-Unsafe patterns:
-```typescript
-// ❌ Bad: Accept messages from any origin
-window.postMessage(data, '*');
-
-window.addEventListener('message', (event) => {
-  processData(event.data); // No origin check!
-});
-```
-
-Safe patterns:
-```typescript
-// ✅ Good: Specify exact origin
-window.postMessage(data, 'https://trusted-origin.com');
-
-// ✅ Good: Validate sender origin
-window.addEventListener('message', (event) => {
-  // Whitelist of trusted origins
-  const trustedOrigins = ['https://app.example.com', 'https://api.example.com'];
-
-  if (!trustedOrigins.includes(event.origin)) {
-    console.warn('Untrusted origin:', event.origin);
-    return; // Ignore message
-  }
-
-  // Validate data structure
-  if (typeof event.data !== 'object' || !event.data.type) {
-    return;
-  }
-
-  processData(event.data);
-});
-```
-
-Additional security:
-- Validate data structure before processing
-- Never execute code from postMessage data
-- Use structured cloning for data transfer
-- Consider using a message protocol/schema""",
     },
     {
         "ruleName": "react_key_index",
         "substrings": ["key={i}", "key={index}", "key={idx}"],
-        "reminder": """⚠️ Best Practice Warning: Using array index as React key can cause issues.
-
-Problems with index keys:
-1. **State bugs**: Component state persists incorrectly when list reorders
-2. **Performance**: React can't optimize reconciliation
-3. **Incorrect updates**: Wrong components receive wrong props
-4. **Animation issues**: Transitions apply to wrong elements
-
-Example of the problem:
-```typescript
-// ❌ Bad: Using index
-{items.map((item, index) => (
-  <TodoItem key={index} {...item} />
-))}
-
-// If items reorder, React thinks item at index 0 is the same component
-// but with different props, causing state and animation issues
-```
-
-Correct approach:
-```typescript
-// ✅ Good: Using stable, unique identifier
-{items.map((item) => (
-  <TodoItem key={item.id} {...item} />
-))}
-```
-
-When index is acceptable:
-- ✅ List never reorders
-- ✅ List is static (no add/remove)
-- ✅ Items have no internal state
-- ✅ No animations or transitions
-
-Best practice: Always use stable, unique identifiers as keys.""",
     },
     {
         "ruleName": "cors_credentials",
         "substrings": ["credentials: 'include'", "withCredentials: true"],
-        "reminder": """⚠️ Security Warning: Using credentials with CORS requires careful configuration.
-
-When you use credentials: 'include' or withCredentials: true:
-
-Security requirements:
-1. ❌ Server CANNOT use Access-Control-Allow-Origin: *
-2. ✅ Server MUST specify exact origin
-3. ✅ Use HTTPS in production (not HTTP)
-4. ✅ Implement CSRF protection
-5. ✅ Validate requests on server side
-
-Example:
-```typescript
-// Frontend
-fetch('/api/data', {
-  credentials: 'include', // Sends cookies
-  headers: {
-    'X-CSRF-Token': getCsrfToken(), // CSRF protection required!
-  }
-});
-
-// Backend must respond with:
-// Access-Control-Allow-Origin: https://your-exact-domain.com (NOT *)
-// Access-Control-Allow-Credentials: true
-// Vary: Origin
-```
-
-Common vulnerabilities:
-- ❌ Using wildcard origin with credentials (blocked by browsers)
-- ❌ Missing CSRF protection
-- ❌ Accepting any origin dynamically without validation
-- ❌ Using HTTP instead of HTTPS
-
-CSRF protection strategies:
-1. Double-submit cookie pattern
-2. Synchronizer token pattern
-3. SameSite cookie attribute (Strict or Lax)
-4. Custom request headers
-
-Safe alternative:
-If you don't need cookies, use Authorization header:
-```typescript
-fetch('/api/data', {
-  headers: {
-    'Authorization': `Bearer ${token}`,
-  }
-});
-```""",
     },
     {
         "ruleName": "window_name_xss",
         "substrings": ["window.name", "window['name']"],
-        "reminder": """⚠️ Security Warning: window.name can be a source of XSS vulnerabilities.
-
-Why it's dangerous:
-- window.name persists across page navigations
-- Can be set by any page (even cross-origin)
-- Often overlooked as untrusted input
-
-Unsafe pattern:
-```typescript
-// ❌ Bad: Direct use of window.name
-document.getElementById('display').innerHTML = window.name;
-eval(window.name); // Very dangerous!
-```
-
-Safe pattern:
-```typescript
-// ✅ Good: Treat as untrusted input
-const name = window.name;
-if (typeof name === 'string' && name.length < 100) {
-  // Validate and sanitize
-  const sanitized = DOMPurify.sanitize(name);
-  element.textContent = sanitized; // Use textContent, not innerHTML
-}
-```
-
-Best practices:
-1. Always validate window.name content
-2. Never execute code from window.name
-3. Never insert into DOM without sanitization
-4. Prefer other storage mechanisms (sessionStorage, state)""",
     },
 ]
 
+# Tools whose input is checked; everything else is allowed straight away
+_RELEVANT_TOOLS = frozenset({"Edit", "Write", "MultiEdit"})
+
+# Path-based patterns are precompiled regexes; content patterns are substring checks
+_PATH_PATTERNS = [p for p in SECURITY_PATTERNS if "path_pattern" in p]
+_SUBSTRING_PATTERNS = [p for p in SECURITY_PATTERNS if "substrings" in p]
+_SUBSTRING_RULE_NAMES = [pattern["ruleName"] for pattern in _SUBSTRING_PATTERNS]
+
+
+# Marker file whose mtime records when state files were last cleaned up
+CLEANUP_STAMP_FILE = "~/.claude/security_warnings_cleanup.stamp"
+CLEANUP_INTERVAL_SECONDS = 24 * 60 * 60
+
+# Unix socket served by --daemon mode (used by security_reminder_client.sh)
+DAEMON_SOCKET_FILE = "~/.claude/security_reminder.sock"
+# Holds the daemon's process ID so the client can tell a dead daemon from a failed call
+DAEMON_PID_FILE = "~/.claude/security_reminder.pid"
+# The daemon exits after this long without a request
+DAEMON_IDLE_TIMEOUT_SECONDS = 30 * 60
+# How long the daemon waits for a client to send its hook input
+DAEMON_READ_TIMEOUT_SECONDS = 5
+
 
 def get_state_file(session_id):
-    """Get session-specific state file path."""
-    return os.path.expanduser(f"~/.claude/security_warnings_state_{session_id}.json")
+    """Get session-specific state file path.
+
+    The file is an append-only log with one JSON-encoded warning key per line.
+    """
+    return os.path.expanduser(f"~/.claude/security_warnings_state_{session_id}.log")
 
 
 def cleanup_old_state_files():
@@ -442,146 +182,433 @@ def cleanup_old_state_files():
         if not os.path.exists(state_dir):
             return
 
-        current_time = datetime.now().timestamp()
+        current_time = time.time()
         thirty_days_ago = current_time - (30 * 24 * 60 * 60)
 
-        for filename in os.listdir(state_dir):
-            if filename.startswith("security_warnings_state_") and filename.endswith(
-                ".json"
-            ):
-                file_path = os.path.join(state_dir, filename)
-                try:
-                    file_mtime = os.path.getmtime(file_path)
-                    if file_mtime < thirty_days_ago:
-                        os.remove(file_path)
-                except (OSError, IOError):
-                    pass  # Ignore errors for individual file cleanup
+        with os.scandir(state_dir) as entries:
+            for entry in entries:
+                # .json files are left over from the previous JSON state format
+                if entry.name.startswith("security_warnings_state_") and entry.name.endswith(
+                    (".log", ".json")
+                ):
+                    try:
+                        if entry.stat().st_mtime < thirty_days_ago:
+                            os.remove(entry.path)
+                    except (OSError, IOError):
+                        pass  # Ignore errors for individual file cleanup
     except Exception:
         pass  # Silently ignore cleanup errors
 
 
-def load_state(session_id):
-    """Load the state of shown warnings from file."""
+def maybe_cleanup_old_state_files():
+    """Run cleanup_old_state_files at most once per CLEANUP_INTERVAL_SECONDS."""
+    stamp_file = os.path.expanduser(CLEANUP_STAMP_FILE)
+    try:
+        last_cleanup = os.path.getmtime(stamp_file)
+    except OSError:
+        last_cleanup = 0
+
+    if time.time() - last_cleanup < CLEANUP_INTERVAL_SECONDS:
+        return
+
+    cleanup_old_state_files()
+    try:
+        with open(stamp_file, "a"):
+            pass
+        os.utime(stamp_file, None)
+    except OSError:
+        pass  # Retry on a later run if the stamp can't be written
+
+
+def load_state(session_id, offset=0):
+    """Load the state of shown warnings from file, starting at byte offset.
+
+    Returns (shown_warnings, end_offset). end_offset stops after the last
+    complete line, so passing it back in reads only warnings appended since.
+    """
     state_file = get_state_file(session_id)
-    if os.path.exists(state_file):
+    try:
+        with open(state_file, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+    except OSError:
+        return set(), 0
+
+    # Leave a line that is still being written for the next read
+    end = data.rfind(b"\n") + 1
+    shown_warnings = set()
+    for line in data[:end].decode("utf-8", "surrogateescape").split("\n"):
         try:
-            with open(state_file, "r") as f:
-                return set(json.load(f))
-        except (json.JSONDecodeError, IOError):
-            return set()
-    return set()
+            shown_warnings.add(json.loads(line))
+        except ValueError:
+            pass  # Skip blank or truncated lines
+    return shown_warnings, offset + end
+
 
+def load_cached_state(session_id, state_cache):
+    """Return a session's shown warnings from state_cache, topped up from file.
 
-def save_state(session_id, shown_warnings):
-    """Save the state of shown warnings to file."""
+    state_cache maps session IDs to (end_offset, shown_warnings). The state file
+    is re-read from end_offset whenever its size changes, so warnings saved by
+    a one-shot hook run while the daemon is alive still reach the daemon.
+    """
+    try:
+        size = os.stat(get_state_file(session_id)).st_size
+    except OSError:
+        size = 0
+
+    cached = state_cache.get(session_id)
+    if cached is None or size < cached[0]:
+        # First request for this session, or the file was removed or replaced
+        shown_warnings, offset = load_state(session_id)
+    elif size > cached[0]:
+        offset, shown_warnings = cached
+        new_warnings, offset = load_state(session_id, offset)
+        shown_warnings |= new_warnings
+    else:
+        return cached[1]
+
+    state_cache[session_id] = (offset, shown_warnings)
+    return shown_warnings
+
+
+def save_state(session_id, warning_key):
+    """Append a newly shown warning to the state file."""
     state_file = get_state_file(session_id)
     try:
         os.makedirs(os.path.dirname(state_file), exist_ok=True)
-        with open(state_file, "w") as f:
-            json.dump(list(shown_warnings), f)
-    except IOError as e:
+        with open(state_file, "a", encoding="utf-8", errors="surrogateescape") as f:
+            # JSON-encode the key so it stays on one ASCII line whatever the path holds
+            f.write(json.dumps(warning_key) + "\n")
+    except (OSError, ValueError) as e:
         debug_log(f"Failed to save state file: {e}")
         pass  # Fail silently if we can't save state
 
 
-def check_patterns(file_path, content):
-    """Check if file path or content matches any security patterns."""
-    # Normalize path by removing leading slashes
-    normalized_path = file_path.lstrip("/")
+def load_reminder(rule_name):
+    """Read the reminder text for a rule, or return None if it can't be read."""
+    reminder_file = os.path.join(REMINDERS_DIR, f"{rule_name}.md")
+    try:
+        with open(reminder_file, "r", encoding="utf-8") as f:
+            return f.read().rstrip("\n")
+    except IOError as e:
+        debug_log(f"Failed to read reminder file: {e}")
+        return None
+
+
+def write_stderr(message):
+    """Write message and a newline to stderr, bypassing the text layer."""
+    sys.stderr.flush()
+    data = memoryview((message + "\n").encode("utf-8"))
+    # A single write normally suffices; loop in case the pipe accepts less
+    while data:
+        data = data[os.write(2, data):]
+
+
+def match_substring_pattern(content, skip_rules=frozenset()):
+    """Return the first content-based pattern found in content, or None.
+
+    Patterns whose ruleName is in skip_rules are ignored.
+
+    Content is scanned as str rather than encoded bytes: ASCII text is already
+    stored one byte per character, and encoding first costs more than it saves.
+    Each `in` check is a C-level search that stops at the first matching rule,
+    which beats an Aho-Corasick automaton whose hits are walked in Python.
+    """
+    if not content:
+        return None
+
+    for pattern in _SUBSTRING_PATTERNS:
+        if pattern["ruleName"] in skip_rules:
+            continue
+        for substring in pattern["substrings"]:
+            if substring in content:
+                return pattern
+
+    return None
+
+
+def get_applicable_rules(file_path):
+    """Return the names of every rule that could match an edit to file_path."""
+    return [
+        pattern["ruleName"]
+        for pattern in _PATH_PATTERNS
+        if pattern["path_pattern"].search(file_path)
+    ] + _SUBSTRING_RULE_NAMES
+
+
+def check_patterns(file_path, contents, skip_rules=frozenset()):
+    """Return the name of the first rule matching the file path or any content chunk.
 
-    for pattern in SECURITY_PATTERNS:
-        # Check path-based patterns
-        if "path_check" in pattern and pattern["path_check"](normalized_path):
-            return pattern["ruleName"], pattern["reminder"]
+    Chunks are scanned one at a time and the first chunk with a match wins.
+    Rules named in skip_rules are ignored. Returns None when nothing matches.
+    """
+    # Check path-based patterns
+    for pattern in _PATH_PATTERNS:
+        if pattern["ruleName"] not in skip_rules and pattern["path_pattern"].search(file_path):
+            return pattern["ruleName"]
 
-        # Check content-based patterns
-        if "substrings" in pattern and content:
-            for substring in pattern["substrings"]:
-                if substring in content:
-                    return pattern["ruleName"], pattern["reminder"]
+    for content in contents:
+        pattern = match_substring_pattern(content, skip_rules)
+        if pattern is not None:
+            return pattern["ruleName"]
 
-    return None, None
+    return None
 
 
 def extract_content_from_input(tool_name, tool_input):
-    """Extract content to check from tool input based on tool type."""
+    """Extract content chunks to check from tool input based on tool type."""
     if tool_name == "Write":
-        return tool_input.get("content", "")
+        return (tool_input.get("content", ""),)
     elif tool_name == "Edit":
-        return tool_input.get("new_string", "")
+        return (tool_input.get("new_string", ""),)
     elif tool_name == "MultiEdit":
-        edits = tool_input.get("edits", [])
-        if edits:
-            return " ".join(edit.get("new_string", "") for edit in edits)
-        return ""
+        # Scan each edit separately rather than joining them into one string
+        return (edit.get("new_string", "") for edit in tool_input.get("edits") or ())
 
-    return ""
+    return ()
 
 
-def main():
-    """Main hook function."""
-    # Check if security reminders are enabled
-    security_reminder_enabled = os.environ.get("ENABLE_SECURITY_REMINDER", "1")
-
-    # Only run if security reminders are enabled
-    if security_reminder_enabled == "0":
-        sys.exit(0)
+def parse_hook_input(raw_input):
+    """Parse hook input bytes, using orjson for large input when it is installed."""
+    if len(raw_input) >= ORJSON_MIN_INPUT_BYTES:
+        try:
+            import orjson
+        except ImportError:
+            pass
+        else:
+            return orjson.loads(raw_input)
+    return json.loads(raw_input)
 
-    # Periodically clean up old state files (10% chance per run)
-    if random.random() < 0.1:
-        cleanup_old_state_files()
 
-    # Read input from stdin
-    try:
-        raw_input = sys.stdin.read()
-        input_data = json.loads(raw_input)
-    except json.JSONDecodeError as e:
-        debug_log(f"JSON decode error: {e}")
-        # Exit code 0: Allow tool to proceed if we can't parse input (fail-safe)
-        sys.exit(0)
+def evaluate_hook_input(input_data, state_cache=None):
+    """Decide whether a tool call should be blocked.
 
+    Returns (exit_code, reminder); reminder is only set when exit_code is 2.
+    state_cache, when given, holds each session's shown warnings between calls
+    so a long-running daemon only reads lines appended to its state file.
+    """
     # Extract session ID and tool information from the hook input
     session_id = input_data.get("session_id", "default")
     tool_name = input_data.get("tool_name", "")
     tool_input = input_data.get("tool_input", {})
 
     # Check if this is a relevant tool
-    if tool_name not in ["Edit", "Write", "MultiEdit"]:
+    if tool_name not in _RELEVANT_TOOLS:
         # Exit code 0: Allow non-file tools to proceed
-        sys.exit(0)
+        return 0, None
 
     # Extract file path from tool_input
     file_path = tool_input.get("file_path", "")
     if not file_path:
         # Exit code 0: Allow if no file path
-        sys.exit(0)
+        return 0, None
+
+    # Load existing warnings for this session
+    if state_cache is None:
+        shown_warnings, _ = load_state(session_id)
+    else:
+        shown_warnings = load_cached_state(session_id, state_cache)
+
+    # Rules already shown for this file can't produce a new warning, so skip them
+    shown_rules = frozenset()
+    if shown_warnings:
+        applicable_rules = get_applicable_rules(file_path)
+        shown_rules = frozenset(
+            rule_name
+            for rule_name in applicable_rules
+            if f"{file_path}-{rule_name}" in shown_warnings
+        )
+        if len(shown_rules) == len(applicable_rules):
+            # Exit code 0: Every warning that can apply to this file has been shown
+            return 0, None
 
     # Extract content to check
-    content = extract_content_from_input(tool_name, tool_input)
+    contents = extract_content_from_input(tool_name, tool_input)
 
-    # Check for security patterns
-    rule_name, reminder = check_patterns(file_path, content)
+    # Check for security patterns not yet shown for this file
+    rule_name = check_patterns(file_path, contents, shown_rules)
 
-    if rule_name and reminder:
+    if rule_name:
         # Create unique warning key
         warning_key = f"{file_path}-{rule_name}"
 
-        # Load existing warnings for this session
-        shown_warnings = load_state(session_id)
-
-        # Check if we've already shown this warning in this session
-        if warning_key not in shown_warnings:
-            # Add to shown warnings and save
+        # Only read the reminder text once we know it will be shown
+        reminder = load_reminder(rule_name)
+        if reminder:
+            # Record the warning as shown
+            save_state(session_id, warning_key)
             shown_warnings.add(warning_key)
-            save_state(session_id, shown_warnings)
 
-            # Output the warning to stderr and block execution
-            print(reminder, file=sys.stderr)
             # Exit code 2: Block tool execution (sends warning to Claude)
-            sys.exit(2)
+            return 2, reminder
 
     # Exit code 0: Allow tool to proceed (no security issues detected)
-    sys.exit(0)
+    return 0, None
+
+
+def main():
+    """Main hook function."""
+    # Check if security reminders are enabled
+    security_reminder_enabled = os.environ.get("ENABLE_SECURITY_REMINDER", "1")
+
+    # Only run if security reminders are enabled
+    if security_reminder_enabled == "0":
+        sys.exit(0)
+
+    if sys.argv[1:] == ["--daemon"]:
+        # Exit code 0: The daemon detaches; this process has nothing to report
+        run_daemon()
+        sys.exit(0)
+
+    # Periodically clean up old state files (at most once a day)
+    maybe_cleanup_old_state_files()
+
+    # Read input from stdin
+    try:
+        # Parse the raw bytes directly instead of decoding them to str first
+        input_data = parse_hook_input(sys.stdin.buffer.read())
+    except ValueError as e:
+        # JSONDecodeError (json and orjson) and UnicodeDecodeError are ValueErrors
+        debug_log(f"JSON decode error: {e}")
+        # Exit code 0: Allow tool to proceed if we can't parse input (fail-safe)
+        sys.exit(0)
+
+    exit_code, reminder = evaluate_hook_input(input_data)
+    if reminder:
+        # Output the warning to stderr and block execution
+        write_stderr(reminder)
+    sys.exit(exit_code)
+
+
+def read_daemon_request(connection):
+    """Read and parse one hook input sent to the daemon.
+
+    Clients are not required to shut down their side of the socket, so
+    reading stops as soon as the data received parses as a JSON object.
+    """
+    chunks = []
+    while True:
+        chunk = connection.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if chunk.rstrip().endswith(b"}"):
+            try:
+                return parse_hook_input(b"".join(chunks))
+            except ValueError:
+                continue  # The "}" was inside a string; keep reading
+    return parse_hook_input(b"".join(chunks))
+
+
+def run_daemon():
+    """Serve hook requests on DAEMON_SOCKET_FILE in a detached process.
+
+    Each session's shown warnings and the debug log handle stay in memory, so
+    a hook call only costs a socket round trip. Each reply is the exit code on
+    the first line followed by the reminder text, if any. The daemon exits
+    when idle for DAEMON_IDLE_TIMEOUT_SECONDS or once this file changes, so the
+    next call starts the updated hook.
+    """
+    # Imported here so one-shot hook runs don't pay for them
+    import socket
+    import socketserver
+
+    if not hasattr(socket, "AF_UNIX") or not hasattr(os, "fork"):
+        debug_log("Daemon mode is not supported on this platform")
+        return
+
+    socket_file = os.path.expanduser(DAEMON_SOCKET_FILE)
+    hook_file = os.path.abspath(__file__)
+    hook_mtime = os.path.getmtime(hook_file)
+
+    # Replace a stale socket left by a daemon that died, but leave a live one alone
+    if os.path.exists(socket_file):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(socket_file)
+        except OSError:
+            try:
+                os.remove(socket_file)
+            except OSError:
+                pass
+        else:
+            return
+        finally:
+            probe.close()
+
+    class HookRequestHandler(socketserver.BaseRequestHandler):
+        def handle(self):
+            self.request.settimeout(DAEMON_READ_TIMEOUT_SECONDS)
+            try:
+                try:
+                    input_data = read_daemon_request(self.request)
+                except ValueError as e:
+                    debug_log(f"JSON decode error: {e}")
+                    exit_code, reminder = 0, None
+                else:
+                    exit_code, reminder = evaluate_hook_input(
+                        input_data, self.server.state_cache
+                    )
+                self.request.sendall(f"{exit_code}\n{reminder or ''}".encode("utf-8"))
+            except OSError as e:
+                debug_log(f"Daemon connection error: {e}")
+
+    class HookDaemon(socketserver.UnixStreamServer):
+        timeout = DAEMON_IDLE_TIMEOUT_SECONDS
+
+        def __init__(self, *args, **kwargs):
+            self.state_cache = {}
+            self.idle = False
+            super().__init__(*args, **kwargs)
+
+        def handle_timeout(self):
+            self.idle = True
+
+    try:
+        os.makedirs(os.path.dirname(socket_file), exist_ok=True)
+        previous_umask = os.umask(0o077)  # Socket is accessible to this user only
+        try:
+            server = HookDaemon(socket_file, HookRequestHandler)
+        finally:
+            os.umask(previous_umask)
+    except OSError as e:
+        # Most likely another daemon started first
+        debug_log(f"Failed to start daemon: {e}")
+        return
+
+    # Detach from the hook process that started us; buffered log lines are
+    # flushed first so the child doesn't write them again
+    flush_debug_log()
+    if os.fork() > 0:
+        server.socket.close()
+        return
+    os.setsid()
+    os.chdir("/")
+
+    pid_file = os.path.expanduser(DAEMON_PID_FILE)
+    try:
+        with open(pid_file, "w") as f:
+            f.write(f"{os.getpid()}\n")
+    except OSError as e:
+        debug_log(f"Failed to write daemon pid file: {e}")
+
+    try:
+        while not server.idle:
+            server.handle_request()
+            maybe_cleanup_old_state_files()
+            flush_debug_log()
+            if os.path.getmtime(hook_file) != hook_mtime:
+                break
+    except OSError as e:
+        debug_log(f"Daemon stopped: {e}")
+    finally:
+        server.server_close()
+        for path in (socket_file, pid_file):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
 
 
 if __name__ == "__main__":